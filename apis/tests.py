@@ -1,3 +1,111 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from rest_framework import status
+from rest_framework.test import APISimpleTestCase
+
+from core.lib import StationCatalog
+
+URL = '/apis/sort_trips/'
+
+
+def bus_pass(source, destination, **extra):
+    return dict({
+        "transport": {"mode": "Bus", "vehicle_id": "NY-123", "seat_number": "B65"},
+        "source": {"location": source},
+        "destination": {"location": destination},
+    }, **extra)
+
+
+class StationCatalogApiTest(APISimpleTestCase):
+
+    def setUp(self) -> None:
+        catalog = StationCatalog([
+            {"mode": "Bus", "code": "BUF", "name": "Buffalo", "city": "New York"},
+            {"mode": "Bus", "code": "ALB", "name": "Albany", "city": "New York"},
+            {"mode": "Train", "code": "SYR", "name": "Syracuse", "city": "New York"},
+        ])
+        patcher = mock.patch('apis.views.station_catalog', catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_station_codes_only(self):
+        response = self.client.post(URL, [bus_pass({"station": "BUF"}, {"station": "ALB"})], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0],
+                         "1. Take bus NY-123 from Buffalo (BUF) bus stop in New York to Albany (ALB) bus stop in New York."
+                         " Seat # B65")
+
+    def test_unknown_station_code(self):
+        response = self.client.post(URL, [bus_pass({"station": "BUF"}, {"station": "ITH"})], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Station not found in catalog"})
+
+    def test_station_code_of_another_mode(self):
+        response = self.client.post(URL, [bus_pass({"station": "BUF"}, {"station": "SYR"})], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Station not found in catalog"})
+
+    def test_station_with_name_and_city(self):
+        response = self.client.post(URL, [bus_pass({"station": "ITH", "name": "Ithaca", "city": "New York"},
+                                                   {"station": "BUF", "name": "Buffalo Depot", "city": "New York"})],
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("to Buffalo Depot (BUF) bus stop", response.data[0])
+
+    def test_unsupported_transport_mode(self):
+        trip = bus_pass({"station": "BUF"}, {"station": "ALB"})
+        trip["transport"]["mode"] = "Ferry"
+        response = self.client.post(URL, [trip], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Transport mode not supported"})
+
+
+class PartitionApiTest(APISimpleTestCase):
+
+    @staticmethod
+    def station(code):
+        return {"station": code, "name": code, "city": "New York"}
+
+    def pool(self, *legs, passenger=None):
+        extra = {} if passenger is None else {"passenger": passenger}
+        return [bus_pass(self.station(source), self.station(destination), **extra) for source, destination in legs]
+
+    @staticmethod
+    def legs(narrations):
+        return [narration.split(" from ")[1].split(" ")[0] for narration in narrations[:-1]]
+
+    def test_partition_mixed_pool(self):
+        data = self.pool(("SWF", "JFK"), ("SYR", "ITH"), ("ALB", "SYR"), ("BUF", "SWF"))
+        response = self.client.post(f"{URL}?partition=true", data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual([self.legs(journey) for journey in response.data], [["ALB", "SYR"], ["BUF", "SWF"]])
+        for journey in response.data:
+            self.assertEqual(journey[-1], "3. You have arrived at your final destination.")
+
+    def test_partition_by_passenger(self):
+        data = self.pool(("ALB", "SYR"), ("SYR", "ITH"), passenger="P1") + \
+            self.pool(("SYR", "BUF"), ("ALB", "SYR"), passenger=2)
+        response = self.client.post(f"{URL}?partition=1", data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertTrue(all(self.legs(journey) == ["ALB", "SYR"] for journey in response.data))
+        self.assertCountEqual([journey[1].split(" to ")[1].split(" ")[0] for journey in response.data], ["ITH", "BUF"])
+
+    def test_partition_ambiguous_pool(self):
+        data = self.pool(("ALB", "SYR"), ("SYR", "ITH"), ("BUF", "SYR"), ("SYR", "SWF"))
+        response = self.client.post(f"{URL}?partition=true", data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Station SYR is the destination of more than one trip"})
+
+    def test_partition_invalid_passenger(self):
+        data = self.pool(("ALB", "SYR"), passenger=["P1"])
+        response = self.client.post(f"{URL}?partition=true", data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Passenger must be a string or a number"})
+
+    def test_partition_false(self):
+        data = self.pool(("SYR", "ITH"), ("ALB", "SYR"))
+        response = self.client.post(f"{URL}?partition=false", data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.legs(response.data), ["ALB", "SYR"])
+        self.assertEqual(response.data[-1], "3. You have arrived at your final destination.")
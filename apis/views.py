@@ -1,8 +1,33 @@
+from django.conf import settings
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.lib import BusTravelPass, Location, TransportMode, TripStation, AirTravelPass, TrainTravelPass, Trip, Journey
+from core.lib import BusTravelPass, Location, TransportMode, TripStation, AirTravelPass, TrainTravelPass, Trip, \
+    Journey, StationCatalog
+
+# Loaded once per process at import time and reused by every request handled by that process.
+station_catalog = StationCatalog.from_csv(settings.STATION_CATALOG_PATH)
+
+
+def trip_station(location, transport_mode):
+    """
+    Builds the trip-station for a `location` node of the request.
+    When the name or city is not given, the shared station from the catalog is used instead.
+    """
+    if 'name' not in location or 'city' not in location:
+        return station_catalog.station(transport_mode, location['station'])
+    return TripStation(Location(location['name'], location['city']), location['station'], transport_mode)
+
+
+def narrate(journey):
+    response = []
+    i = 1
+    for trip in journey.sorted_trips():
+        response.append(f"{i}. {str(trip)}")
+        i += 1
+    response.append(f"{i}. You have arrived at your final destination.")
+    return response
 
 
 @api_view(['GET', 'POST'])
@@ -81,22 +106,26 @@ def sort_trips(request):
         }
         return Response(sample_request)
     else:
-        response = []
         trips = []
         for trip in request.data:
             transport = trip.get("transport")
 
+            transport_mode = TransportMode.to_transport_mode(transport['mode'])
+            if transport_mode is None:
+                response = {"error": "Transport mode not supported"}
+                return Response(response, status.HTTP_400_BAD_REQUEST)
+
             source = trip.get("source")
-            source_location = Location(source['location']['name'], source['location']['city'])
-            source_station = TripStation(source_location, source['location']['station'],
-                                         TransportMode.to_transport_mode(transport['mode']))
+            source_station = trip_station(source['location'], transport_mode)
 
             destination = trip.get("destination")
-            destination_location = Location(destination['location']['name'], destination['location']['city'])
-            destination_station = TripStation(destination_location, destination['location']['station'],
-                                              TransportMode.to_transport_mode(transport['mode']))
+            destination_station = trip_station(destination['location'], transport_mode)
+
+            if source_station is None or destination_station is None:
+                response = {"error": "Station not found in catalog"}
+                return Response(response, status.HTTP_400_BAD_REQUEST)
 
-            if TransportMode.to_transport_mode(transport['mode']) == TransportMode.AIRPLANE:
+            if transport_mode == TransportMode.AIRPLANE:
                 boarding_pass = AirTravelPass(
                     source_station,
                     destination_station,
@@ -105,29 +134,29 @@ def sort_trips(request):
                     gate_number=transport['gate_number'],
                     baggage_counter=transport['baggage_counter'])
 
-            elif TransportMode.to_transport_mode(transport['mode']) == TransportMode.BUS:
+            elif transport_mode == TransportMode.BUS:
                 boarding_pass = BusTravelPass(
                     source_station,
                     destination_station,
                     vehicle_id=transport['vehicle_id'],
                     seat_number=transport['seat_number'])
 
-            elif TransportMode.to_transport_mode(transport['mode']) == TransportMode.TRAIN:
+            else:
                 boarding_pass = TrainTravelPass(
                     source_station,
                     destination_station,
                     vehicle_id=transport['vehicle_id'],
                     seat_number=transport['seat_number'],
                     platform_number=transport['platform_number'])
-            else:
-                response = {"error": "Transport mode not supported"}
-                http_status = status.HTTP_400_BAD_REQUEST
+            passenger = trip.get("passenger")
+            if passenger is not None and (isinstance(passenger, bool) or not isinstance(passenger, (str, int, float))):
+                response = {"error": "Passenger must be a string or a number"}
                 return Response(response, status.HTTP_400_BAD_REQUEST)
-            trips.append(Trip(boarding_pass))
-        journey = Journey(trips)
-        i = 1
-        for trip in journey.sorted_trips():
-            response.append(f"{i}. {str(trip)}")
-            i += 1
-        response.append(f"{i}. You have arrived at your final destination.")
-        return Response(response)
+            trips.append(Trip(boarding_pass, passenger_id=passenger))
+        if request.query_params.get("partition", "").lower() in ("true", "1"):
+            try:
+                journeys = Journey.partition(trips)
+            except ValueError as e:
+                return Response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+            return Response([narrate(journey) for journey in journeys])
+        return Response(narrate(Journey(trips)))
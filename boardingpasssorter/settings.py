@@ -112,3 +112,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
     ]
 }
+
+# Station catalog loaded once at startup, lets boarding passes refer to stations by code only.
+# Each row is `mode,code,name,city`, see `core.lib.StationCatalog`.
+
+STATION_CATALOG_PATH = BASE_DIR / 'data' / 'stations.csv'
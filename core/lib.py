@@ -1,3 +1,4 @@
+import csv
 from abc import ABC, abstractmethod
 from enum import Enum
 
@@ -76,6 +77,64 @@ class TripStation:
         return f"{self.location.name} ({self.code}) {station} in {self.location.city}"
 
 
+class StationCatalog:
+    """
+    An index of known trip-stations keyed by transport mode and station code.
+    The catalog is meant to be loaded once and shared, so that boarding passes can refer to a station by its code
+    alone and reuse the same `TripStation` instance instead of building new ones for every pass.
+    """
+
+    FIELDS = ('mode', 'code', 'name', 'city')
+
+    def __init__(self, rows=()):
+        self._stations = {}
+        for row in rows:
+            self.add(row['mode'], row['code'], row['name'], row['city'])
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Loads a catalog from a CSV file with a header row of `mode,code,name,city`,
+        where `mode` is one of the `TransportMode` values, e.g. `Airplane,BUF,Buffalo,New York`.
+        """
+        with open(path, newline='', encoding='utf-8') as csv_file:
+            reader = csv.DictReader(csv_file)
+            missing = [field for field in cls.FIELDS if field not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"Station catalog '{path}' is missing columns: {', '.join(missing)}")
+            catalog = cls()
+            for row in reader:
+                try:
+                    catalog.add(row['mode'], row['code'], row['name'], row['city'])
+                except ValueError as e:
+                    raise ValueError(f"Station catalog '{path}', line {reader.line_num}: {e}") from e
+            return catalog
+
+    def add(self, mode: str, code: str, name: str, city: str):
+        if not all(value and value.strip() for value in (mode, code, name, city)):
+            raise ValueError("Station mode, code, name and city are all required")
+        transport_mode = TransportMode.to_transport_mode(mode)
+        if transport_mode is None:
+            raise ValueError(f"'{mode}' transport mode not supported")
+        if (transport_mode, code) in self._stations:
+            raise ValueError(f"Duplicate {mode} station {code}")
+        station = TripStation(Location(name, city), code, transport_mode)
+        self._stations[(transport_mode, code)] = station
+        return station
+
+    def station(self, transport_mode: TransportMode, code: str):
+        """
+        Returns the shared `TripStation` for the given transport mode and code, or None if it is not catalogued.
+        """
+        return self._stations.get((transport_mode, code))
+
+    def __contains__(self, key):
+        return key in self._stations
+
+    def __len__(self):
+        return len(self._stations)
+
+
 class TravelPass(ABC):
     """
     An abstract class forming the base for trip passes for different transport modes.
@@ -169,13 +228,15 @@ class AirTravelPass(TravelPass):
 class Trip:
     """
     Represents a trip in a journey. A journey may involve taking multiple trips.
-    A `Trip` instance consists of the source location, the destination location and mode of transport
+    A `Trip` instance consists of the source location, the destination location and mode of transport.
+    Optionally it may identify the passenger taking the trip, to tell apart journeys of different travellers.
     """
 
-    def __init__(self, boarding_pass: TravelPass):
+    def __init__(self, boarding_pass: TravelPass, passenger_id: str = None):
         self.source: Location = boarding_pass.source_station.location
         self.destination: Location = boarding_pass.destination_station.location
         self.boarding_pass: TravelPass = boarding_pass
+        self.passenger_id = passenger_id
 
     def __str__(self) -> str:
         # return f"From {self.source} to {self.destination} via {self.boarding_pass.vehicle_type()}"
@@ -210,6 +271,49 @@ class Journey:
     def __init__(self, trips):
         self.trips = trips
 
+    @classmethod
+    def partition(cls, trips):
+        """
+        Splits a pool of unordered trips belonging to several journeys into separate journeys, each with its trips in
+        itinerary order. Trips are first grouped by passenger id, when given, and each group is then split into chains
+        of trips connected by their destination-source stations.
+        Raises ValueError when the trips of a group cannot be chained unambiguously, i.e. when a station is the source
+        or the destination of more than one trip, or when trips form a cycle.
+        """
+        passenger_trips = {}
+        for trip in trips:
+            passenger_trips.setdefault(trip.passenger_id, []).append(trip)
+
+        journeys = []
+        for passenger_id, group in passenger_trips.items():
+            passenger_note = "" if passenger_id is None else f" for passenger {passenger_id}"
+            source_trips = {}
+            destinations = set()
+            for trip in group:
+                source_station = trip.boarding_pass.source_station.code
+                destination_station = trip.boarding_pass.destination_station.code
+                if source_station in source_trips:
+                    raise ValueError(f"Station {source_station} is the source of more than one trip{passenger_note}")
+                if destination_station in destinations:
+                    raise ValueError(
+                        f"Station {destination_station} is the destination of more than one trip{passenger_note}")
+                source_trips[source_station] = trip
+                destinations.add(destination_station)
+
+            chained = 0
+            for trip in group:
+                if trip.boarding_pass.source_station.code in destinations:
+                    continue
+                chain = []
+                while trip is not None:
+                    chain.append(trip)
+                    trip = source_trips.get(trip.boarding_pass.destination_station.code)
+                chained += len(chain)
+                journeys.append(cls(chain))
+            if chained != len(group):
+                raise ValueError(f"Trips{passenger_note} form a cycle")
+        return journeys
+
     def sorted_trips(self):
         """
         Sorts a list of unordered trips by chaining their destination-source stations.
@@ -218,7 +322,6 @@ class Journey:
         if self.trips:
             source_trips = {}  # trips with the key as their source
             destination_trips = {}  # trips with the key as their destination
-            head_node = None
             for trip in self.trips:
                 source_station = trip.boarding_pass.source_station.code
                 destination_station = trip.boarding_pass.destination_station.code
@@ -228,17 +331,15 @@ class Journey:
                     temp_node = source_trips[destination_station]
                     new_node.next_node = temp_node
                     # print(f"-> {new_node.trip.boarding_pass.source_station.code} will point to {destination_station}")
-                    head_node = new_node
                 if source_station in destination_trips:
                     temp_node = destination_trips[source_station]
                     temp_node.next_node = new_node
                     # print(f"-> {temp_node.trip.boarding_pass.source_station.code} will point to {source_station}")
-                if not head_node:
-                    head_node = new_node
                 source_trips[source_station] = new_node
                 destination_trips[destination_station] = new_node
 
-            head = head_node
+            # The head is the only trip whose source is not the destination of another trip.
+            head = next((node for station, node in source_trips.items() if station not in destination_trips), None)
             while head is not None:
                 yield head.trip
                 head = head.next_node
@@ -0,0 +1,203 @@
+"""
+Randomized differential harness for the trip sorting engines.
+
+Generates seeded, shuffled chains of trips and pools of interleaved chains, sorts them with every engine and checks the
+result against a simple reference sorter run per chain, recording time and peak memory per size so that super-linear
+behaviour shows up early.
+
+Run from the root directory of the project:
+
+    python -m core.scaling --sizes 1000 100000 1000000 --seed 7
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from core.lib import TripStation, AirTravelPass, Location, TransportMode, Trip, Journey, BusTravelPass, \
+    TrainTravelPass
+
+MODES = (TransportMode.AIRPLANE, TransportMode.BUS, TransportMode.TRAIN)
+
+# Mode patterns of generated chains: a random mode per leg, a single mode throughout, or long runs of alternating modes.
+PATTERNS = ('mixed', 'single', 'alternating')
+
+
+def mode_sequence(legs: int, pattern: str, rng: random.Random, run_length: int = 50):
+    if pattern == 'mixed':
+        return [rng.choice(MODES) for _ in range(legs)]
+    elif pattern == 'single':
+        return [rng.choice(MODES)] * legs
+    elif pattern == 'alternating':
+        return [MODES[(i // run_length) % len(MODES)] for i in range(legs)]
+    raise ValueError(f"'{pattern}' pattern not supported")
+
+
+def boarding_pass(source_station: TripStation, destination_station: TripStation, transport_mode: TransportMode):
+    if transport_mode == TransportMode.AIRPLANE:
+        return AirTravelPass(source_station, destination_station, vehicle_id="AB-001", seat_number="45B",
+                             gate_number="3A", baggage_counter="344")
+    elif transport_mode == TransportMode.BUS:
+        return BusTravelPass(source_station, destination_station, vehicle_id="BUS-001", seat_number="12")
+    return TrainTravelPass(source_station, destination_station, vehicle_id="T-001", seat_number="B63",
+                           platform_number="7")
+
+
+def build_chain(codes, modes, passenger_id=None):
+    trips = []
+    for i, transport_mode in enumerate(modes):
+        source_station = TripStation(Location(codes[i], "City"), codes[i], transport_mode)
+        destination_station = TripStation(Location(codes[i + 1], "City"), codes[i + 1], transport_mode)
+        trips.append(Trip(boarding_pass(source_station, destination_station, transport_mode), passenger_id))
+    return trips
+
+
+def generate_chain(legs: int, pattern: str = 'mixed', seed: int = 0):
+    """
+    Generates a chain of `legs` connected trips over randomly coded stations.
+    Returns the trips in itinerary order along with a shuffled copy.
+    """
+    rng = random.Random(seed)
+    codes = [f"S{i}" for i in rng.sample(range(legs + 1), legs + 1)]
+    trips = build_chain(codes, mode_sequence(legs, pattern, rng))
+    shuffled = list(trips)
+    rng.shuffle(shuffled)
+    return trips, shuffled
+
+
+def generate_pool(legs: int, chains: int, pattern: str = 'mixed', seed: int = 0):
+    """
+    Generates `chains` interleaved chains with `legs` trips in total, e.g. the passes of a group booking.
+    Every other chain belongs to its own passenger and may share stations with any other chain, the rest have no
+    passenger id and stations not shared among them.
+    Returns the chains with their trips in itinerary order along with a shuffled pool of all trips.
+    """
+    rng = random.Random(seed)
+    station_count = legs + chains
+    anonymous_codes = iter(rng.sample(range(station_count), station_count))
+    result = []
+    for j in range(chains):
+        length = legs // chains + (j < legs % chains)
+        if j % 2:
+            passenger_id = f"P{j}"
+            codes = rng.sample(range(station_count), length + 1)
+        else:
+            passenger_id = None
+            codes = [next(anonymous_codes) for _ in range(length + 1)]
+        result.append(build_chain([f"S{i}" for i in codes], mode_sequence(length, pattern, rng), passenger_id))
+    pool = [trip for chain in result for trip in chain]
+    rng.shuffle(pool)
+    return result, pool
+
+
+def reference_sorted_trips(trips):
+    """
+    Reference sorter: starts from the trip whose source is nobody's destination and follows destination-source stations.
+    """
+    source_trips = {trip.boarding_pass.source_station.code: trip for trip in trips}
+    destinations = {trip.boarding_pass.destination_station.code for trip in trips}
+    heads = [trip for trip in trips if trip.boarding_pass.source_station.code not in destinations]
+    trip = heads[0] if heads else None
+    result = []
+    while trip is not None:
+        result.append(trip)
+        trip = source_trips.get(trip.boarding_pass.destination_station.code)
+    return result
+
+
+def same_chains(result, expected):
+    """
+    Tells whether both lists hold the same chains of trips, in any order of chains, matching chains by their head trip.
+    """
+    if len(result) != len(expected):
+        return False
+    expected_chains = {id(chain[0]): chain for chain in expected if chain}
+    for chain in result:
+        expected_chain = expected_chains.pop(id(chain[0]), None) if chain else None
+        if expected_chain is None or len(chain) != len(expected_chain) or \
+                not all(a is b for a, b in zip(chain, expected_chain)):
+            return False
+    return True
+
+
+def journey_engine(trips):
+    return [list(Journey(trips).sorted_trips())]
+
+
+def partition_engine(trips):
+    return [list(journey.sorted_trips()) for journey in Journey.partition(trips)]
+
+
+# Every engine returns the sorted chains found in the trips; only those in `POOL_ENGINES` can split a pool of chains.
+ENGINES = {
+    'sorted_trips': journey_engine,
+    'partition': partition_engine,
+}
+POOL_ENGINES = ('partition',)
+
+
+def measure(engine, trips):
+    """
+    Runs the engine on the trips, returns its result, elapsed seconds and peak traced memory in bytes.
+    The time is taken from a run without tracing, since tracing slows down every allocation, and, like `timeit`,
+    with garbage collection disabled so that collecting the generated trips is not counted against the engine.
+    """
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = engine(trips)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        engine(trips)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def positive_int(value):
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number of legs")
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare trip sorting engines with the reference sorter.")
+    parser.add_argument('--sizes', type=positive_int, nargs='+', default=[1, 1000, 10000, 100000, 1000000])
+    parser.add_argument('--patterns', nargs='+', choices=PATTERNS, default=list(PATTERNS))
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument('--chains', type=positive_int, default=10, help="number of chains in a pool of passes")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    print(f"{'engine':<14}{'pattern':<13}{'chains':>8}{'legs':>10}{'seconds':>12}{'peak MiB':>12}{'us/leg':>10}"
+          f"  result")
+    for size in args.sizes:
+        for pattern in args.patterns:
+            chain, shuffled = generate_chain(size, pattern, args.seed)
+            workloads = [(args.engines, [chain], shuffled)]
+            chains, pool = generate_pool(size, min(args.chains, size), pattern, args.seed)
+            workloads.append(([name for name in args.engines if name in POOL_ENGINES], chains, pool))
+            for engines, expected, trips in workloads:
+                for expected_chain in expected:
+                    if reference_sorted_trips(random.Random(args.seed).sample(expected_chain, len(expected_chain))) \
+                            != expected_chain:
+                        raise AssertionError(f"Reference sorter failed for {size} {pattern} legs")
+                for name in engines:
+                    result, elapsed, peak = measure(ENGINES[name], trips)
+                    matches = same_chains(result, expected)
+                    mismatches += not matches
+                    print(f"{name:<14}{pattern:<13}{len(expected):>8}{size:>10}{elapsed:>12.3f}{peak / 2 ** 20:>12.1f}"
+                          f"{elapsed / size * 1e6:>10.2f}  {'ok' if matches else 'MISMATCH'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 
 from core.lib import TripStation, AirTravelPass, Location, TransportMode, Trip, Journey, BusTravelPass, \
-    TrainTravelPass
+    TrainTravelPass, StationCatalog
+from core.scaling import ENGINES, PATTERNS, POOL_ENGINES, generate_chain, generate_pool, reference_sorted_trips, \
+    same_chains
 
 
 class TripTest(unittest.TestCase):
@@ -114,3 +118,139 @@ class JourneyTest(unittest.TestCase):
         result = list(journey.sorted_trips())
         self.assertEqual(result,
                          [trip1, trip2, trip3], "Trips are not sorted")
+
+
+class JourneyScalingTest(unittest.TestCase):
+
+    def test_head_not_first_or_last(self):
+        expected, _ = generate_chain(3, seed=1)
+        shuffled = [expected[2], expected[0], expected[1]]
+        self.assertEqual(list(Journey(shuffled).sorted_trips()), expected, "Trips are not sorted")
+
+    def test_engines_match_reference(self):
+        for size in (1, 2, 3, 10, 1000):
+            for pattern in PATTERNS:
+                for seed in range(3):
+                    expected, shuffled = generate_chain(size, pattern, seed)
+                    self.assertEqual(reference_sorted_trips(shuffled), expected)
+                    for name, engine in ENGINES.items():
+                        with self.subTest(engine=name, size=size, pattern=pattern, seed=seed):
+                            self.assertTrue(same_chains(engine(shuffled), [expected]), "Trips are not sorted")
+
+    def test_pool_engines_match_reference(self):
+        for size, chains in ((1, 1), (2, 2), (10, 3), (1000, 10), (1000, 1000)):
+            for pattern in PATTERNS:
+                for seed in range(3):
+                    expected, pool = generate_pool(size, chains, pattern, seed)
+                    self.assertEqual(sum(map(len, expected)), size)
+                    for chain in expected:
+                        self.assertEqual(reference_sorted_trips(chain[::-1]), chain)
+                    for name in POOL_ENGINES:
+                        with self.subTest(engine=name, size=size, chains=chains, pattern=pattern, seed=seed):
+                            self.assertTrue(same_chains(ENGINES[name](pool), expected), "Pool is not partitioned")
+
+
+class JourneyPartitionTest(unittest.TestCase):
+
+    @staticmethod
+    def bus_trip(source, destination, passenger_id=None):
+        return Trip(
+            BusTravelPass(
+                TripStation(Location(source, "New York"), source, TransportMode.BUS),
+                TripStation(Location(destination, "New York"), destination, TransportMode.BUS),
+                vehicle_id="NY BUS 01",
+                seat_number="12"),
+            passenger_id=passenger_id)
+
+    def test_empty_pool(self):
+        self.assertListEqual(Journey.partition([]), [], "Empty pool returned journeys")
+
+    def test_partition_by_stations(self):
+        trip1 = self.bus_trip("ALB", "SYR")
+        trip2 = self.bus_trip("SYR", "ITH")
+        trip3 = self.bus_trip("BUF", "SWF")
+        trip4 = self.bus_trip("SWF", "JFK")
+
+        journeys = Journey.partition([trip4, trip2, trip1, trip3])
+        result = [list(journey.sorted_trips()) for journey in journeys]
+        self.assertCountEqual(result, [[trip1, trip2], [trip3, trip4]], "Pool is not partitioned into journeys")
+
+    def test_partition_by_passenger(self):
+        trip1 = self.bus_trip("ALB", "SYR", passenger_id="P1")
+        trip2 = self.bus_trip("SYR", "ITH", passenger_id="P1")
+        trip3 = self.bus_trip("ALB", "SYR", passenger_id="P2")
+        trip4 = self.bus_trip("SYR", "BUF", passenger_id="P2")
+
+        journeys = Journey.partition([trip4, trip2, trip1, trip3])
+        result = [[(trip.passenger_id, trip.boarding_pass.destination_station.code) for trip in journey.sorted_trips()]
+                  for journey in journeys]
+        self.assertCountEqual(result, [[("P1", "SYR"), ("P1", "ITH")], [("P2", "SYR"), ("P2", "BUF")]],
+                              "Pool is not partitioned by passenger")
+
+    def test_shared_source_station(self):
+        with self.assertRaises(ValueError):
+            Journey.partition([self.bus_trip("ALB", "SYR"), self.bus_trip("SYR", "ITH"),
+                               self.bus_trip("BUF", "SYR"), self.bus_trip("SYR", "SWF")])
+
+    def test_shared_destination_station(self):
+        with self.assertRaisesRegex(ValueError, "^Station SYR is the destination of more than one trip$"):
+            Journey.partition([self.bus_trip("ALB", "SYR"), self.bus_trip("BUF", "SYR")])
+
+    def test_cycle(self):
+        with self.assertRaisesRegex(ValueError, "^Trips for passenger P form a cycle$"):
+            Journey.partition([self.bus_trip("ALB", "SYR", passenger_id="P"),
+                               self.bus_trip("SYR", "ALB", passenger_id="P")])
+
+
+class StationCatalogTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.catalog = StationCatalog([
+            {"mode": "Airplane", "code": "BUF", "name": "Buffalo", "city": "New York"},
+            {"mode": "Train", "code": "BUF", "name": "Buffalo Exchange Street", "city": "New York"},
+        ])
+
+    def test_station_lookup(self):
+        station = self.catalog.station(TransportMode.AIRPLANE, "BUF")
+        self.assertEqual(station, TripStation(Location("Buffalo", "New York"), "BUF", TransportMode.AIRPLANE))
+        self.assertEqual(station.location, Location("Buffalo", "New York"))
+
+    def test_station_indexed_by_mode(self):
+        station = self.catalog.station(TransportMode.TRAIN, "BUF")
+        self.assertEqual(station.location.name, "Buffalo Exchange Street")
+        self.assertIsNone(self.catalog.station(TransportMode.BUS, "BUF"), "Uncatalogued station was found")
+
+    def test_station_is_shared(self):
+        self.assertIs(self.catalog.station(TransportMode.AIRPLANE, "BUF"),
+                      self.catalog.station(TransportMode.AIRPLANE, "BUF"), "Catalog station is not shared")
+
+    def test_from_csv(self):
+        catalog = StationCatalog.from_csv(self.catalog_file("mode,code,name,city\nBus,ALB,Albany,New York\n"))
+        self.assertEqual(len(catalog), 1)
+        self.assertIn((TransportMode.BUS, "ALB"), catalog)
+
+    def catalog_file(self, content):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write(content)
+        self.addCleanup(os.remove, csv_file.name)
+        return csv_file.name
+
+    def test_from_csv_missing_columns(self):
+        with self.assertRaises(ValueError):
+            StationCatalog.from_csv(self.catalog_file("mode,code,name\nBus,ALB,Albany\n"))
+
+    def test_from_csv_unknown_mode(self):
+        path = self.catalog_file("mode,code,name,city\nBus,ALB,Albany,New York\nFerry,SYR,Syracuse,New York\n")
+        with self.assertRaisesRegex(ValueError, f"{path}', line 3: 'Ferry'"):
+            StationCatalog.from_csv(path)
+
+    def test_from_csv_missing_fields(self):
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            StationCatalog.from_csv(self.catalog_file("mode,code,name,city\nBus,ALB,Albany\n"))
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            StationCatalog.from_csv(self.catalog_file("mode,code,name,city\nBus,ALB,,New York\n"))
+
+    def test_from_csv_duplicate_station(self):
+        path = self.catalog_file("mode,code,name,city\nBus,ALB,Albany,New York\nBus,ALB,Albany Bus,New York\n")
+        with self.assertRaisesRegex(ValueError, "line 3: Duplicate Bus station ALB"):
+            StationCatalog.from_csv(path)